@@ -1,6 +1,7 @@
 from determined.common.schemas.expconf._validate import (
     sanity_validation_errors,
     completeness_validation_errors,
+    iter_validation_errors,
     get_default,
     get_schema,
 )
@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, Iterator, List, Optional
 
 import jsonschema
 
@@ -6,6 +7,31 @@ from determined.common.schemas import extensions, util
 from determined.common.schemas.expconf import _gen
 
 _validators = {"sanity": {}, "completeness": {}}  # type: Dict[str, Any]
+_validator_classes = {}  # type: Dict[str, Any]
+_validators_lock = threading.Lock()
+
+_EXT = {
+    "disallowProperties": extensions.disallowProperties,
+    "union": extensions.union,
+    "checks": extensions.checks,
+    "compareProperties": extensions.compareProperties,
+    "optionalRef": extensions.optionalRef,
+}
+
+_COMPLETENESS_EXT = {
+    **_EXT,
+    "eventuallyRequired": extensions.eventuallyRequired,
+    "eventually": extensions.eventually,
+}
+
+
+def _validator_class(key: str) -> Any:
+    # Extending the validator class is expensive, so only do it once per process for each
+    # flavor of validation.  Callers must hold _validators_lock.
+    if key not in _validator_classes:
+        ext = _COMPLETENESS_EXT if key == "completeness" else _EXT
+        _validator_classes[key] = jsonschema.validators.extend(jsonschema.Draft7Validator, ext)
+    return _validator_classes[key]
 
 
 def make_validator(url: Optional[str] = None, complete: Optional[bool] = False) -> Any:
@@ -13,35 +39,33 @@ def make_validator(url: Optional[str] = None, complete: Optional[bool] = False)
     if url is None:
         url = "http://determined.ai/schemas/expconf/v0/experiment.json"
 
-    global _validators
     key = "completeness" if complete else "sanity"
-    if url in _validators[key]:
-        return _validators[key][url]
 
-    schema = _gen.schemas[url]
+    # Lock-free fast path; validators are never evicted once cached.
+    validator = _validators[key].get(url)
+    if validator is not None:
+        return validator
 
-    resolver = jsonschema.RefResolver(
-        base_uri=url,
-        referrer=schema,
-        handlers={"http": lambda url: _gen.schemas[url]},
-    )
+    with _validators_lock:
+        # Another thread may have built the validator while we waited for the lock.
+        if url in _validators[key]:
+            return _validators[key][url]
 
-    validator = jsonschema.Draft7Validator(schema=schema, resolver=resolver)
-    ext = {
-        "disallowProperties": extensions.disallowProperties,
-        "union": extensions.union,
-        "checks": extensions.checks,
-        "compareProperties": extensions.compareProperties,
-        "optionalRef": extensions.optionalRef,
-    }
-    if complete:
-        ext["eventuallyRequired"] = extensions.eventuallyRequired
-        ext["eventually"] = extensions.eventually
+        schema = _gen.schemas[url]
 
-    cls = jsonschema.validators.extend(validator, ext)
-    _validators[key][url] = cls(schema=schema, resolver=resolver)
+        resolver = jsonschema.RefResolver(
+            base_uri=url,
+            referrer=schema,
+            handlers={"http": _gen.schemas.__getitem__},
+        )
+        # Seed the resolver's store with every known schema so that $ref resolution is a plain
+        # dict hit rather than a trip through the url handler.
+        resolver.store.update(_gen.schemas)
 
-    return _validators[key][url]
+        cls = _validator_class(key)
+        _validators[key][url] = cls(schema=schema, resolver=resolver)
+
+        return _validators[key][url]
 
 
 def sanity_validation_errors(instance: Any, url: Optional[str] = None) -> List[str]:
@@ -54,6 +78,19 @@ def completeness_validation_errors(instance: Any, url: Optional[str] = None) ->
     return _validate(instance, validator)
 
 
+def iter_validation_errors(
+    instance: Any, url: Optional[str] = None, complete: Optional[bool] = False
+) -> Iterator[str]:
+    """
+    Yield formatted validation errors one at a time, unsorted.
+
+    Since jsonschema produces errors lazily, callers which only care whether there is any error
+    at all (or only want the first one) can stop early without validating the whole instance.
+    """
+    validator = make_validator(url, complete=complete)
+    return util.iter_formatted_validation_errors(validator.iter_errors(instance))
+
+
 def _validate(instance: Any, validator: Any) -> List[str]:
     errors = validator.iter_errors(instance)
     return util.format_validation_errors(errors)
@@ -1,4 +1,4 @@
-from typing import Any, List
+from typing import Any, Iterable, Iterator, List
 
 
 def _path_string(json_path: str) -> str:
@@ -10,5 +10,11 @@ def _fmt_msg(e: Any) -> str:
     return f"<config>{path}: {e.message}"
 
 
-def format_validation_errors(errors: List) -> List[str]:
-    return sorted(_fmt_msg(e) for e in errors)
+def iter_formatted_validation_errors(errors: Iterable) -> Iterator[str]:
+    """Lazily format validation errors, in the order they are produced by the validator."""
+    for e in errors:
+        yield _fmt_msg(e)
+
+
+def format_validation_errors(errors: Iterable) -> List[str]:
+    return sorted(iter_formatted_validation_errors(errors))
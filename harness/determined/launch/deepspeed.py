@@ -142,6 +142,18 @@ def create_sshd_cmd() -> List[str]:
     ]
 
 
+# Env vars which are forwarded to every rank through the deepspeed launcher's env file.
+DEEPSPEED_ENV_INCLUDE = frozenset(
+    [
+        "PATH",
+        "LD_LIBRARY_PATH",
+        "USE_DEEPSPEED",
+        "DET_CHIEF_IP",
+        "DET_MANUAL_INIT_DISTRIBUTED",
+    ]
+)
+
+
 def create_deepspeed_env_file() -> None:
     """Create an env var export file to pass Determined vars to the deepspeed launcher.
 
@@ -151,24 +163,13 @@ def create_deepspeed_env_file() -> None:
     There are certain variables that we need to be set that we can pass to deepspeed using
     a custom env vars file.
     """
-    INCLUDE = [
-        "PATH",
-        "LD_LIBRARY_PATH",
-        "USE_DEEPSPEED",
-        "DET_CHIEF_IP",
-        "DET_MANUAL_INIT_DISTRIBUTED",
-    ]
+    # We need to turn our envvars into shell-escaped strings to export them correctly since values
+    # may contain spaces and quotes.  shlex.quote was removed from the deepspeed launcher in 0.6.2
+    # so we add it here for this version onwards.
+    quote = shlex.quote if deepspeed_version >= version.parse("0.6.2") else str
+    lines = [f"{k}={quote(v)}\n" for k, v in os.environ.items() if k in DEEPSPEED_ENV_INCLUDE]
     with open(DEEPSPEED_ENVIRONMENT_NAME, "w") as f:
-        environ = os.environ.copy()
-        for k, v in environ.items():
-            if k in INCLUDE:
-                # We need to turn our envvars into shell-escaped strings to export them correctly
-                # since values may contain spaces and quotes.  shlex.quote was removed from the
-                # deepspeed launcher in 0.6.2 so we add it here for this version onwards.
-                if deepspeed_version >= version.parse("0.6.2"):
-                    f.write(f"{k}={shlex.quote(v)}\n")
-                else:
-                    f.write(f"{k}={v}\n")
+        f.writelines(lines)
 
 
 def create_run_command(master_address: str, hostfile_path: Optional[str]) -> List[str]:
@@ -319,8 +320,7 @@ def main(script: List[str]) -> int:
         # close to in-step by now because all machines just finished synchronizing rendezvous
         # info.
         deadline = time.time() + 20
-        for peer_addr in info.container_addrs:
-            util.check_sshd(peer_addr, deadline, constants.DTRAIN_SSH_PORT)
+        util.check_sshd_all(info.container_addrs, deadline, constants.DTRAIN_SSH_PORT)
 
         p = subprocess.Popen(full_cmd)
         with det.util.forward_signals(p):
@@ -6,7 +6,10 @@ from determined.pytorch._data import (
     adapt_batch_sampler,
     data_length,
     to_device,
+    _to_device,
     _dataset_repro_warning,
+    _PinnedBufferPool,
+    _DevicePrefetcher,
 )
 from determined.pytorch._callback import PyTorchCallback
 from determined.pytorch._lr_scheduler import LRScheduler
@@ -22,6 +25,8 @@ from determined.pytorch._metric_utils import (
     _prepare_metrics_reducers,
     _reduce_metrics,
     _convert_metrics_to_numpy,
+    _convert_batch_metrics_to_numpy,
+    _copy_metrics_to_host_async,
 )
 from determined.pytorch._experimental import PyTorchExperimentalContext
 from determined.pytorch._pytorch_context import PyTorchTrialContext
@@ -8,6 +8,7 @@ from typing import (
     Optional,
     Sequence,
     Set,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -338,6 +339,114 @@ def data_length(data: _Data) -> int:
     raise TypeError("Data of incorrect type: {}".format(type(data)))
 
 
+class _PinnedBufferPool:
+    """
+    Page-locked host buffers, kept for the life of a trial, for staging CPU tensors on their way
+    to a GPU.
+
+    Pinning memory is expensive, so rather than pinning every batch the pool copies each tensor
+    into a buffer that was pinned once and issues a non-blocking copy from there. Buffers are keyed
+    by dtype and trailing shape; the leading (batch) dimension is rounded up to a power of two so
+    that a short final batch reuses the same buffer. Each key has two buffers which are used in
+    turn, and an event recorded after each copy keeps a buffer from being overwritten while its
+    previous copy is still in flight.
+    """
+
+    def __init__(self, device: torch.device) -> None:
+        self._device = device
+        self._buffers = {}  # type: Dict[Tuple[torch.dtype, torch.Size], List[Any]]
+        self._next_slot = {}  # type: Dict[Tuple[torch.dtype, torch.Size], int]
+
+    def to_device(self, tensor: torch.Tensor) -> torch.Tensor:
+        if tensor.device.type != "cpu" or tensor.dim() == 0 or tensor.is_pinned():
+            return tensor.to(self._device)
+
+        key = (tensor.dtype, tensor.shape[1:])
+        slots = self._buffers.setdefault(key, [[None, None], [None, None]])
+        idx = self._next_slot.get(key, 0)
+        self._next_slot[key] = 1 - idx
+        slot = slots[idx]
+
+        num_rows = tensor.shape[0]
+        if slot[0] is None or slot[0].shape[0] < num_rows:
+            capacity = 1 << max(num_rows - 1, 0).bit_length()
+            slot[0] = torch.empty(
+                (capacity, *tensor.shape[1:]), dtype=tensor.dtype, pin_memory=True
+            )
+        elif slot[1] is not None:
+            slot[1].synchronize()
+
+        staging = slot[0][:num_rows]
+        staging.copy_(tensor)
+        out = staging.to(self._device, non_blocking=True)
+
+        slot[1] = torch.cuda.Event()
+        slot[1].record(torch.cuda.current_stream(self._device))
+        return out
+
+
+class _DevicePrefetcher:
+    """
+    Wrap a training iterator so that the next batch is moved to the GPU on a side stream while the
+    current batch is being trained on.
+
+    Call preload() once the work for the current batch has been queued; the following next() waits
+    for that copy on the current stream instead of blocking the host. If nothing was preloaded,
+    next() fetches and copies the batch itself.
+    """
+
+    def __init__(
+        self, iterator: Iterator, to_device: Callable[[Any], Any], device: torch.device
+    ) -> None:
+        self._iterator = iterator
+        self._to_device = to_device
+        self._stream = torch.cuda.Stream(device)
+        self._next = None  # type: Any
+        self._loaded = False
+        self._stop = None  # type: Optional[StopIteration]
+
+    def preload(self) -> None:
+        if self._loaded:
+            return
+        try:
+            batch = next(self._iterator)
+        except StopIteration as e:
+            # Only surface the end of the data when the caller actually asks for another batch.
+            self._stop = e
+            return
+        with torch.cuda.stream(self._stream):
+            self._next = self._to_device(batch)
+        self._loaded = True
+
+    def __iter__(self) -> "_DevicePrefetcher":
+        return self
+
+    def __next__(self) -> Any:
+        self.preload()
+        if not self._loaded:
+            assert self._stop is not None
+            raise self._stop
+        current = torch.cuda.current_stream(self._stream.device)
+        current.wait_stream(self._stream)
+        batch, self._next, self._loaded = self._next, None, False
+        _record_stream(batch, current)
+        return batch
+
+
+def _record_stream(data: Any, stream: torch.cuda.Stream) -> None:
+    # Tell the caching allocator that tensors allocated on the side stream are used on `stream`,
+    # so their memory is not handed out again while kernels there may still read it.
+    if isinstance(data, torch.Tensor):
+        if data.is_cuda:
+            data.record_stream(stream)
+    elif isinstance(data, dict):
+        for v in data.values():
+            _record_stream(v, stream)
+    elif isinstance(data, (list, tuple)):
+        for v in data:
+            _record_stream(v, stream)
+
+
 def to_device(
     data: _Data, device: torch.device, warned_types: Optional[Set[Type]] = None
 ) -> TorchData:
@@ -349,22 +458,41 @@ def to_device(
     If the data cannot be moved to device, log a warning (only once per type) and return the
     original data.
     """
+    return _to_device(data, device, warned_types, None)
+
+
+def _to_device(
+    data: _Data,
+    device: torch.device,
+    warned_types: Optional[Set[Type]],
+    pinned_pool: Optional[_PinnedBufferPool],
+) -> TorchData:
+    """
+    to_device(), except that tensors and ndarrays are staged through pinned_pool's buffers when
+    it is given.
+    """
     # Never print errors recursively.
     if warned_types is None:
         warned_types = set()
 
     if isinstance(data, dict):
-        return {k: to_device(v, device, warned_types) for k, v in data.items()}  # type: ignore
+        return {
+            k: _to_device(v, device, warned_types, pinned_pool) for k, v in data.items()
+        }  # type: ignore
     elif isinstance(data, list):
-        return [to_device(d, device, warned_types) for d in data]  # type: ignore
+        return [_to_device(d, device, warned_types, pinned_pool) for d in data]  # type: ignore
     elif isinstance(data, tuple):
-        return tuple(to_device(d, device, warned_types) for d in data)  # type: ignore
+        return tuple(_to_device(d, device, warned_types, pinned_pool) for d in data)  # type: ignore
     elif isinstance(data, np.ndarray):
         # Torch supports floats, complex floats, ints, uints, and bools as tensors.
         # Those correspond to numpy dtype kinds: "f", "c", "i", "u", and "b", respectively.
         # Do not attempt to convert any other kinds to tensors.
         if data.dtype.kind in "fciub":
+            if pinned_pool is not None:
+                return pinned_pool.to_device(torch.from_numpy(data))
             return torch.from_numpy(data).to(device)
+    elif pinned_pool is not None and isinstance(data, torch.Tensor):
+        return pinned_pool.to_device(data)
     elif hasattr(data, "to") and callable(data.to):  # type: ignore
         return data.to(device)  # type: ignore
 
@@ -1,6 +1,8 @@
 import logging
 from typing import Any
 
+from determined import pytorch
+
 # AMP is only available in PyTorch 1.6+
 try:
     import torch.cuda.amp as amp
@@ -15,6 +17,7 @@ class PyTorchExperimentalContext:
         self._auto_amp = False
         self._data_repro_checks_disabled = False
         self._auto_to_device = True
+        self._prefetch_to_device = False
 
     def use_amp(self) -> None:
         """
@@ -78,3 +81,35 @@ class PyTorchExperimentalContext:
         """
         self._auto_to_device = False
         logging.info("disabled automatically moving data to device")
+
+    def use_pinned_staging_buffers(self) -> None:
+        """
+        Copy CPU batches through page-locked host buffers that are allocated once and reused for
+        the rest of the trial, instead of copying them to the GPU from pageable memory. The copy
+        to the GPU is then asynchronous, without pinning a fresh buffer for every batch.
+
+        Tensors that are already pinned, for example by a ``DataLoader`` created with
+        ``pin_memory=True``, are moved as usual. Pinned memory cannot be swapped out, so on hosts
+        with little memory to spare this can make training slower; that is why it is off by
+        default. This has no effect when training without a GPU.
+        """
+        if self._parent.device.type != "cuda":
+            logging.warning("pinned staging buffers are only used when training on a GPU")
+            return
+        self._parent._pinned_pool = pytorch._PinnedBufferPool(self._parent.device)
+        logging.info("enabled pinned staging buffers for moving data to device")
+
+    def prefetch_batches_to_device(self) -> None:
+        """
+        Fetch each training batch and move it to the GPU on a separate CUDA stream while the
+        previous batch is still training, so that the host-to-device copy overlaps with compute
+        instead of leaving the GPU idle. The copy only runs asynchronously when the batch is in
+        pinned memory, so combine this with a ``DataLoader`` created with ``pin_memory=True`` or
+        with :meth:`use_pinned_staging_buffers`.
+
+        The next batch is drawn from the training data loader before the current one has finished,
+        so do not use this if your data loader depends on state updated by ``train_batch``. This
+        has no effect when training without a GPU or after :meth:`disable_auto_to_device`.
+        """
+        self._prefetch_to_device = True
+        logging.info("enabled prefetching training batches to device")
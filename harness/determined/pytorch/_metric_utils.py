@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Optional, Tuple, Union, cast
+import collections
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union, cast
 
 import numpy as np
 import torch
@@ -7,6 +8,46 @@ import determined as det
 from determined import pytorch, util
 
 
+class _StackedMetric(NamedTuple):
+    """A per-batch metric series whose values were all ndarrays of one dtype and shape."""
+
+    values: np.ndarray
+
+
+def _stack_metrics_for_gather(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stack each per-batch metric series whose values are all ndarrays of a single dtype and shape
+    into one array, so that gathering it pickles a single buffer rather than one ndarray object per
+    batch. Anything else is passed through unchanged.
+    """
+    stacked = {}  # type: Dict[str, Any]
+    for name, values in metrics.items():
+        if (
+            isinstance(values, list)
+            and values
+            and all(
+                isinstance(v, np.ndarray)
+                and v.dtype == values[0].dtype
+                and v.shape == values[0].shape
+                for v in values
+            )
+        ):
+            stacked[name] = _StackedMetric(np.stack(values))
+        else:
+            stacked[name] = values
+    return stacked
+
+
+def _unstack_gathered_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    # Indexing with [i, ...] yields an ndarray even for 0-d values, matching what was stacked.
+    return {
+        name: [v.values[i, ...] for i in range(len(v.values))]
+        if isinstance(v, _StackedMetric)
+        else v
+        for name, v in metrics.items()
+    }
+
+
 def _process_combined_metrics_and_batches(
     combined_metrics_and_batches: List[Any],
 ) -> Tuple[Dict[str, Any], List[int]]:
@@ -27,33 +68,37 @@ def _average_training_metrics(
     combined_timeseries: Dict[str, Any], combined_num_batches: List[int]
 ) -> List[Dict[str, Any]]:
     """Average combined training metrics across GPUs"""
-    # If the value for a metric is a single-element array, the averaging process will
-    # change that into just the element. We record what metrics are single-element arrays
-    # so we can wrap them in an array later (for perfect compatibility with non-averaging
-    # codepath).
-    array_metrics = []
-    for metric_name in combined_timeseries.keys():
-        process_batches = combined_timeseries[metric_name]
-        if isinstance(process_batches[0][0], np.ndarray):
-            array_metrics.append(metric_name)
-
     num_batches = combined_num_batches[0]  # num_batches matches across data parallel ranks.
     num_processes = len(combined_num_batches)
     averaged_metrics_timeseries = {}  # type: Dict[str, List]
 
-    for metric_name in combined_timeseries.keys():
-        averaged_metrics_timeseries[metric_name] = []
-        for batch_idx in range(num_batches):
-            batch = [
-                combined_timeseries[metric_name][process_idx][batch_idx]
-                for process_idx in range(num_processes)
-            ]
-
-            np_batch = np.array(batch)
-            batch_avg = np.mean(np_batch[np_batch != None])  # noqa: E711
-            if metric_name in array_metrics:
-                batch_avg = np.array(batch_avg)
-            averaged_metrics_timeseries[metric_name].append(batch_avg)
+    for metric_name, process_batches in combined_timeseries.items():
+        # If the value for a metric is a single-element array, the averaging process will
+        # change that into just the element. We record whether the metric is an array so
+        # we can wrap it in an array later (for perfect compatibility with non-averaging
+        # codepath).
+        is_array_metric = isinstance(process_batches[0][0], np.ndarray)
+
+        # Build a single (num_processes, num_batches, values) array so every batch is averaged in
+        # one float64 reduction. Ragged or non-numeric metrics, and those with missing (None)
+        # values, are not converted and fall back to averaging each batch on its own, which skips
+        # None.
+        np_batches = util._as_float_array(process_batches)
+        if np_batches is not None and np_batches.size:
+            np_batches = np_batches.reshape(num_processes, num_batches, -1)
+            batch_avgs = list(np_batches.mean(axis=(0, 2)))
+        else:
+            batch_avgs = []
+            for batch_idx in range(num_batches):
+                batch = [
+                    process_batches[process_idx][batch_idx] for process_idx in range(num_processes)
+                ]
+                np_batch = np.array(batch)
+                batch_avgs.append(np.mean(np_batch[np_batch != None]))  # noqa: E711
+
+        if is_array_metric:
+            batch_avgs = [np.array(batch_avg) for batch_avg in batch_avgs]
+        averaged_metrics_timeseries[metric_name] = batch_avgs
     return util._dict_to_list(averaged_metrics_timeseries)
 
 
@@ -66,13 +111,14 @@ def _combine_metrics_across_processes(
     ), "_combine_metrics_across_processes should only be called if context.distributed > 1"
 
     # all_args is a list of [(metrics, num_batches), ...] for each worker.
-    all_args = context.gather((metrics, num_batches))
+    all_args = context.gather((_stack_metrics_for_gather(metrics), num_batches))
 
     if not context.rank == 0:
         return None, None
 
     # Remove items without keys in dictionary. These are from intermediate model parallel nodes.
     assert all_args is not None, "gathered metrics should not be None"
+    all_args = [(_unstack_gathered_metrics(m), n) for m, n in all_args]
     return _process_combined_metrics_and_batches(all_args)
 
 
@@ -125,10 +171,105 @@ def _prepare_metrics_reducers(
 
 
 def _convert_metrics_to_numpy(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    return _convert_batch_metrics_to_numpy([metrics])[0]
+
+
+def _copy_metrics_to_host_async(metrics: Dict[str, Any]) -> Set[torch.device]:
+    """
+    Move one batch's CUDA metrics to the host without waiting on scalar metrics. One-element
+    tensors are copied with a non-blocking copy, which captures their value as of this batch even
+    if the trial later updates them in place; the devices those copies were queued on are
+    returned, and must be passed to _convert_batch_metrics_to_numpy() before the values are read.
+    Larger tensors are copied right away, so that validation never holds more than a scalar per
+    metric per batch in device memory.
+    """
+    devices = set()  # type: Set[torch.device]
     for metric_name, metric_val in metrics.items():
-        if isinstance(metric_val, torch.Tensor):
-            metrics[metric_name] = metric_val.cpu().numpy()
-    return metrics
+        if isinstance(metric_val, torch.Tensor) and metric_val.is_cuda:
+            if metric_val.numel() <= 1:
+                devices.add(metric_val.device)
+                metrics[metric_name] = metric_val.detach().to("cpu", non_blocking=True)
+            else:
+                metrics[metric_name] = metric_val.detach().cpu()
+    return devices
+
+
+def _convert_batch_metrics_to_numpy(
+    batch_metrics: List[Dict[str, Any]], pending_devices: Iterable[torch.device] = ()
+) -> List[Dict[str, Any]]:
+    """
+    Convert every tensor metric to an ndarray. pending_devices are the devices that
+    _copy_metrics_to_host_async() queued copies on, which are waited on along with any copies
+    made here.
+    """
+    # Queue every device-to-host copy before waiting on any of them, so converting N GPU metrics
+    # costs one stream synchronization rather than N.
+    devices = set(pending_devices)
+    for metrics in batch_metrics:
+        for metric_name, metric_val in metrics.items():
+            if isinstance(metric_val, torch.Tensor) and metric_val.is_cuda:
+                devices.add(metric_val.device)
+                metrics[metric_name] = metric_val.detach().to("cpu", non_blocking=True)
+    for device in devices:
+        torch.cuda.current_stream(device).synchronize()
+
+    for metrics in batch_metrics:
+        for metric_name, metric_val in metrics.items():
+            if isinstance(metric_val, torch.Tensor):
+                # Detach before any copy, and only copy tensors that are not already on the host.
+                metric_val = metric_val.detach()
+                if metric_val.device.type != "cpu":
+                    metric_val = metric_val.cpu()
+                metrics[metric_name] = metric_val.numpy()
+    return batch_metrics
+
+
+def _simple_reduce_metrics_by_group(
+    metrics_reducers: Dict[str, pytorch.Reducer],
+    metrics: Dict[str, Any],
+    num_batches: Optional[List[int]] = None,
+) -> Dict[str, Any]:
+    """
+    Reduce every metric as pytorch._simple_reduce_metrics() would, but stack metrics that share a
+    reducer, dtype, and size so each group is reduced with one NumPy call instead of one per metric.
+    """
+    arrays = {name: np.asarray(values) for name, values in metrics.items()}
+    groups = collections.defaultdict(list)  # type: Dict[Tuple[Any, ...], List[str]]
+    for name, arr in arrays.items():
+        groups[(metrics_reducers[name], arr.dtype, arr.shape)].append(name)
+
+    reduced = {}  # type: Dict[str, Any]
+    for (reducer, dtype, shape), names in groups.items():
+        # Weighted averages are only defined for one value per weight; leave anything else, and
+        # anything NumPy can't reduce natively, to the per-metric path and its error handling.
+        batchable = (
+            len(names) > 1
+            and dtype != object
+            and np.prod(shape) > 0
+            and (not num_batches or reducer != pytorch.Reducer.AVG or shape == (len(num_batches),))
+        )
+        if not batchable:
+            for name in names:
+                reduced[name] = pytorch._simple_reduce_metrics(
+                    reducer=reducer, metrics=arrays[name], num_batches=num_batches
+                )
+            continue
+
+        stacked = np.stack([arrays[name].reshape(-1) for name in names])
+        if reducer == pytorch.Reducer.AVG:
+            values = np.average(stacked, axis=1, weights=num_batches or None)
+        elif reducer == pytorch.Reducer.SUM:
+            values = stacked.sum(axis=1)
+        elif reducer == pytorch.Reducer.MAX:
+            values = stacked.max(axis=1)
+        elif reducer == pytorch.Reducer.MIN:
+            values = stacked.min(axis=1)
+        else:
+            raise NotImplementedError
+        reduced.update(zip(names, values))
+
+    # Keep the caller's metric order.
+    return {name: reduced[name] for name in metrics}
 
 
 def _reduce_metrics(
@@ -139,14 +280,14 @@ def _reduce_metrics(
 ) -> Dict[str, Any]:
     metrics = {}
     if len(batch_metrics):
-        metrics = {
-            name: pytorch._simple_reduce_metrics(
-                reducer=metrics_reducers[name],
-                metrics=np.stack([b[name] for b in batch_metrics], axis=0),
-                num_batches=None,
-            )
-            for name in keys or []
-        }
+        # Transpose the per-batch dicts into per-metric columns in a single pass.
+        columns = {name: [] for name in keys or []}  # type: Dict[str, List[Any]]
+        for b in batch_metrics:
+            for name, column in columns.items():
+                column.append(b[name])
+        metrics = _simple_reduce_metrics_by_group(
+            metrics_reducers, {name: np.stack(column, axis=0) for name, column in columns.items()}
+        )
 
     if context.size > 1:
         # If using distributed training, combine metrics across all processes.
@@ -159,14 +300,11 @@ def _reduce_metrics(
             # Only the chief collects all the metrics.
             assert combined_metrics is not None
             combined_metrics = _convert_metrics_to_numpy(combined_metrics)
-            metrics = {
-                name: pytorch._simple_reduce_metrics(
-                    reducer=metrics_reducers[name],
-                    metrics=combined_metrics[name],
-                    num_batches=batches_per_process,
-                )
-                for name in keys or []
-            }
+            metrics = _simple_reduce_metrics_by_group(
+                metrics_reducers,
+                {name: combined_metrics[name] for name in keys or []},
+                num_batches=batches_per_process,
+            )
         else:
             return {}
 
@@ -64,6 +64,12 @@ class PyTorchTrialContext(det.TrialContext, pytorch._PyTorchReducerContext):
         # Track which types we have issued warnings for in to_device().
         self._to_device_warned_types = set()  # type: Set[Type]
 
+        # Set by experimental.use_pinned_staging_buffers().
+        self._pinned_pool = None  # type: Optional[pytorch._PinnedBufferPool]
+
+        # Created on first use by get_generator().
+        self._generator = None  # type: Optional[torch.Generator]
+
         # The following attributes are initialized during the lifetime of
         # a PyTorchTrialContext.
         self.models = []  # type: List[nn.Module]
@@ -117,6 +123,35 @@ class PyTorchTrialContext(det.TrialContext, pytorch._PyTorchReducerContext):
         """
         return self._per_slot_batch_size
 
+    def get_generator(self) -> torch.Generator:
+        """
+        Return a ``torch.Generator`` seeded with the trial seed. Pass it as the ``generator``
+        argument of a ``DataLoader`` so that shuffling and worker seeding draw from a dedicated
+        random number generator instead of the global ``torch`` one. The same generator is
+        returned on every call.
+
+        DataLoader workers seed ``torch`` themselves, but not ``random`` or ``numpy``. If your
+        dataset uses either of those, seed them per worker as well:
+
+        .. code-block:: python
+
+            def seed_worker(worker_id):
+                worker_seed = torch.initial_seed() % 2 ** 32
+                numpy.random.seed(worker_seed)
+                random.seed(worker_seed)
+
+            DataLoader(
+                dataset,
+                batch_size=self.context.get_per_slot_batch_size(),
+                shuffle=True,
+                generator=self.context.get_generator(),
+                worker_init_fn=seed_worker,
+            )
+        """
+        if self._generator is None:
+            self._generator = torch.Generator().manual_seed(self.get_trial_seed())
+        return self._generator
+
     def autocast_forward_pass(self, to_wrap: torch.nn.Module) -> torch.nn.Module:
         # First, ensure the forward pass is wrapped in an autocast context:
         class _AutocastForwardPassModel(type(to_wrap)):  # type: ignore
@@ -349,7 +384,9 @@ class PyTorchTrialContext(det.TrialContext, pytorch._PyTorchReducerContext):
         on the fly.
         """
         with self._record_timing("to_device", accumulate=True):
-            return pytorch.to_device(data, self.device, self._to_device_warned_types)
+            return pytorch._to_device(
+                data, self.device, self._to_device_warned_types, self._pinned_pool
+            )
 
     def wrap_scaler(self, scaler: Any) -> Any:
         """
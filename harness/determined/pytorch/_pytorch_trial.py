@@ -1,3 +1,4 @@
+import concurrent.futures
 import contextlib
 import json
 import logging
@@ -6,9 +7,23 @@ import pickle
 import random
 import sys
 import time
+import zipfile
 from abc import abstractmethod
 from inspect import signature
-from typing import Any, Callable, Dict, Iterator, List, Optional, Type, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 import numpy as np
 import torch
@@ -39,6 +54,46 @@ class PyTorchTrialController(det.TrialController):
             self.prof._set_sync_device(self._sync_device)
         self.callbacks = self.trial.build_callbacks()
 
+        # Callbacks are fixed for the life of the trial, so resolve the profiler timing names and
+        # the hooks each callback overrides once, rather than on every batch or validation.
+        self._cb_timing_names = {
+            name: {
+                hook: f"callbacks.{callback.__class__.__name__}.{hook}"
+                for hook in (
+                    "on_trial_startup",
+                    "on_trial_shutdown",
+                    "on_training_start",
+                    "on_training_epoch_start",
+                    "on_training_epoch_end",
+                )
+            }
+            for name, callback in self.callbacks.items()
+        }  # type: Dict[str, Dict[str, str]]
+        self._cb_overrides = {
+            name: {
+                hook: util.is_overridden(getattr(callback, hook), pytorch.PyTorchCallback)
+                for hook in (
+                    "on_validation_step_start",
+                    "on_validation_step_end",
+                    "on_validation_end",
+                    "load_state_dict",
+                )
+            }
+            for name, callback in self.callbacks.items()
+        }  # type: Dict[str, Dict[str, bool]]
+        if any(overrides["on_validation_step_start"] for overrides in self._cb_overrides.values()):
+            logging.warning(
+                "on_validation_step_start is now deprecated, please use on_validation_start instead"
+            )
+        if any(overrides["on_validation_step_end"] for overrides in self._cb_overrides.values()):
+            logging.warning(
+                "on_validation_step_end is now deprecated, please use on_validation_end instead"
+            )
+        self._cb_epoch_start_takes_idx = {
+            name: bool(signature(callback.on_training_epoch_start).parameters)
+            for name, callback in self.callbacks.items()
+        }  # type: Dict[str, bool]
+
         check.gt_eq(
             len(self.context.models),
             1,
@@ -53,6 +108,18 @@ class PyTorchTrialController(det.TrialController):
         )
         self._check_evaluate_implementation()
 
+        # The scaler and AMP mode are fixed once the trial has been constructed.
+        self._auto_update_scaler = bool(
+            self.context._scaler and self.context.experimental._auto_amp
+        )
+
+        # In debug mode, report device synchronizations caused by evaluate_batch().
+        self._warn_on_sync = (
+            self.env.experiment_config.debug_enabled()
+            and torch.cuda.is_available()
+            and hasattr(torch.cuda, "set_sync_debug_mode")
+        )
+
         self.wlsq = None  # type: Optional[layers.WorkloadSequencer]
         if self.workloads is None:
             self.workloads, self.wlsq = layers.make_compatibility_workloads(
@@ -63,6 +130,9 @@ class PyTorchTrialController(det.TrialController):
 
         self.steps_completed = self.env.steps_completed
 
+        # Set in run() when training batches are prefetched to the GPU.
+        self._prefetcher = None  # type: Optional[pytorch._DevicePrefetcher]
+
         # Currently only horovod and torch backends are supported for distributed training
         if self.context.distributed.size > 1:
             assert (
@@ -217,18 +287,14 @@ class PyTorchTrialController(det.TrialController):
         # don't bind a the loop iteration variable `callback`, which would likely cause us to call
         # on_trial_shutdown() multiple times for the final callback, and not at all for the others.
         def on_shutdown(callback_name: str, on_trial_shutdown: Callable) -> None:
-            with self.prof.record_timing(f"callbacks.{callback_name}.on_trial_shutdown"):
+            with self.prof.record_timing(self._cb_timing_names[callback_name]["on_trial_shutdown"]):
                 on_trial_shutdown()
 
         with contextlib.ExitStack() as exit_stack:
-            for callback in self.callbacks.values():
-                with self.prof.record_timing(
-                    f"callbacks.{callback.__class__.__name__}.on_trial_startup"
-                ):
+            for name, callback in self.callbacks.items():
+                with self.prof.record_timing(self._cb_timing_names[name]["on_trial_startup"]):
                     callback.on_trial_startup(self.steps_completed, self.env.latest_checkpoint)
-                exit_stack.enter_context(
-                    defer(on_shutdown, callback.__class__.__name__, callback.on_trial_shutdown)
-                )
+                exit_stack.enter_context(defer(on_shutdown, name, callback.on_trial_shutdown))
 
             self._set_data_loaders()
 
@@ -239,10 +305,19 @@ class PyTorchTrialController(det.TrialController):
             # We create it before loading state because we don't want the training_iterator
             # shuffling values after we load state.
             self.training_iterator = iter(self.training_loader)
+            if (
+                self.context.experimental._prefetch_to_device
+                and self.context.experimental._auto_to_device
+                and self.context.device.type == "cuda"
+            ):
+                self._prefetcher = pytorch._DevicePrefetcher(
+                    self.training_iterator, self.context.to_device, self.context.device
+                )
 
             def cleanup_iterator() -> None:
                 # Explicitly trigger the training iterator's shutdown (which happens in __del__).
                 # See the rather long note in pytorch/torch/utils/data/dataloader.py.
+                self._prefetcher = None
                 del self.training_iterator
 
             exit_stack.enter_context(defer(cleanup_iterator))
@@ -261,10 +336,8 @@ class PyTorchTrialController(det.TrialController):
                     hvd.broadcast_optimizer_state(optimizer, root_rank=0)
 
             with self.prof:
-                for callback in self.callbacks.values():
-                    with self.prof.record_timing(
-                        f"callbacks.{callback.__class__.__name__}.on_training_start"
-                    ):
+                for name, callback in self.callbacks.items():
+                    with self.prof.record_timing(self._cb_timing_names[name]["on_training_start"]):
                         callback.on_training_start()
                 self._run()
 
@@ -319,10 +392,11 @@ class PyTorchTrialController(det.TrialController):
         return batch_id // self.context._epoch_len  # type: ignore
 
     def _auto_step_lr_scheduler_per_batch(
-        self, batch_idx: int, lr_scheduler: pytorch.LRScheduler
+        self, batch_idx: int, lr_scheduler: pytorch.LRScheduler, epoch_idx: Optional[int] = None
     ) -> None:
         """
         This function aims at automatically step a LR scheduler. It should be called per batch.
+        Callers that already know the epoch of batch_idx may pass it as epoch_idx.
         """
 
         # Never step lr when we do not step optimizer.
@@ -330,16 +404,21 @@ class PyTorchTrialController(det.TrialController):
             return
 
         if lr_scheduler._step_mode == pytorch.LRScheduler.StepMode.STEP_EVERY_BATCH:
+            # Step once for every batch i in [start_idx, batch_idx] where (i + 1) is a multiple of
+            # the scheduler frequency.
             start_idx = batch_idx - self.context._aggregation_frequency + 1
-            for i in range(start_idx, batch_idx + 1):
-                if (i + 1) % lr_scheduler._frequency == 0:
-                    lr_scheduler.step()
+            num_steps = (batch_idx + 1) // lr_scheduler._frequency - (
+                start_idx // lr_scheduler._frequency
+            )
+            for _ in range(num_steps):
+                lr_scheduler.step()
         elif lr_scheduler._step_mode == pytorch.LRScheduler.StepMode.STEP_EVERY_OPTIMIZER_STEP:
             if (batch_idx + 1) % lr_scheduler._frequency == 0:
                 lr_scheduler.step()
         elif lr_scheduler._step_mode == pytorch.LRScheduler.StepMode.STEP_EVERY_EPOCH:
             # We will step if the next optimizer step will land in the next epoch.
-            epoch_idx = self.get_epoch_idx(batch_idx)
+            if epoch_idx is None:
+                epoch_idx = self.get_epoch_idx(batch_idx)
             next_steppable_batch = batch_idx + self.context._aggregation_frequency
             next_batch_epoch_idx = self.get_epoch_idx(next_steppable_batch)
             for e in range(epoch_idx, next_batch_epoch_idx):
@@ -347,7 +426,7 @@ class PyTorchTrialController(det.TrialController):
                     lr_scheduler.step()
 
     def _should_update_scaler(self) -> bool:
-        if not self.context._scaler or not self.context.experimental._auto_amp:
+        if not self._auto_update_scaler:
             return False
         if self.context.distributed.size > 1:
             return self.context._should_communicate_and_update()  # type: ignore
@@ -369,6 +448,8 @@ class PyTorchTrialController(det.TrialController):
         start = total_batches_processed
         end = start + num_batches
 
+        world_size = self.context.distributed.size
+
         per_batch_metrics = []  # type: List[Dict]
         num_inputs = 0
 
@@ -377,23 +458,25 @@ class PyTorchTrialController(det.TrialController):
             batch_start_time = time.time()
             self.prof.update_batch_idx(batch_idx)
             with self.prof.record_timing("dataloader_next", requires_sync=False):
-                batch = next(self.training_iterator)
+                if self._prefetcher is not None:
+                    batch = next(self._prefetcher)
+                else:
+                    batch = next(self.training_iterator)
             batch_inputs = self.trial.get_batch_length(batch)
             num_inputs += batch_inputs
 
-            if self.context.experimental._auto_to_device:
+            if self.context.experimental._auto_to_device and self._prefetcher is None:
                 with self.prof.record_timing("to_device", accumulate=True):
                     batch = self.context.to_device(batch)
 
             self.context._current_batch_idx = batch_idx
             epoch_idx = self.get_epoch_idx(batch_idx)
             if self.context.is_epoch_start():
-                for callback in self.callbacks.values():
+                for name, callback in self.callbacks.items():
                     with self.prof.record_timing(
-                        f"callbacks.{callback.__class__.__name__}.on_training_epoch_start"
+                        self._cb_timing_names[name]["on_training_epoch_start"]
                     ):
-                        sig = signature(callback.on_training_epoch_start)
-                        if sig.parameters:
+                        if self._cb_epoch_start_takes_idx[name]:
                             callback.on_training_epoch_start(epoch_idx)
                         else:
                             logging.warning(
@@ -419,6 +502,9 @@ class PyTorchTrialController(det.TrialController):
                         epoch_idx=epoch_idx,
                         batch_idx=batch_idx,
                     )
+            if self._prefetcher is not None:
+                # The GPU work for this batch is queued; start copying the next one behind it.
+                self._prefetcher.preload()
             if self._should_update_scaler():
                 self.context._scaler.update()
             if isinstance(tr_metrics, torch.Tensor):
@@ -433,45 +519,45 @@ class PyTorchTrialController(det.TrialController):
             # Step learning rate of a pytorch.LRScheduler.
             with self.prof.record_timing("step_lr_schedulers"):
                 for lr_scheduler in self.context.lr_schedulers:
-                    self._auto_step_lr_scheduler_per_batch(batch_idx, lr_scheduler)
+                    self._auto_step_lr_scheduler_per_batch(batch_idx, lr_scheduler, epoch_idx)
 
             with self.prof.record_timing("from_device"):
-                for name, metric in tr_metrics.items():
-                    # Convert PyTorch metric values to NumPy, so that
-                    # `det.util.encode_json` handles them properly without
-                    # needing a dependency on PyTorch.
-                    if isinstance(metric, torch.Tensor):
-                        metric = metric.cpu().detach().numpy()
-                    tr_metrics[name] = metric
+                # Convert PyTorch metric values to NumPy, so that
+                # `det.util.encode_json` handles them properly without
+                # needing a dependency on PyTorch.
+                tr_metrics = pytorch._convert_metrics_to_numpy(tr_metrics)
 
             batch_dur = time.time() - batch_start_time
             samples_per_second = batch_inputs / batch_dur
-            samples_per_second *= self.context.distributed.size
+            samples_per_second *= world_size
             self.prof.record_metric("samples_per_second", samples_per_second)
             per_batch_metrics.append(tr_metrics)
 
             if self.context.is_epoch_end():
-                for callback in self.callbacks.values():
+                for name, callback in self.callbacks.items():
                     with self.prof.record_timing(
-                        f"callbacks.{callback.__class__.__name__}.on_training_epoch_end"
+                        self._cb_timing_names[name]["on_training_epoch_end"]
                     ):
                         callback.on_training_epoch_end(epoch_idx)
 
         # Aggregate and reduce training metrics from all the training processes.
-        if self.context.distributed.size > 1 and self.context._average_training_metrics:
+        if world_size > 1 and self.context._average_training_metrics:
             with self.prof.record_timing("average_training_metrics"):
                 per_batch_metrics = pytorch._combine_and_average_training_metrics(
                     self.context.distributed, per_batch_metrics
                 )
-        num_inputs *= self.context.distributed.size
+        num_inputs *= world_size
         metrics = det.util.make_metrics(num_inputs, per_batch_metrics)
 
         # Ignore batch_metrics entirely for custom reducers; there's no guarantee that per-batch
         # metrics are even logical for a custom reducer.
-        with self.prof.record_timing("reduce_metrics"):
-            metrics["avg_metrics"].update(
-                pytorch._convert_metrics_to_numpy(self.context.reduce_metrics(for_training=True))
-            )
+        if self.context._wrapped_reducers:
+            with self.prof.record_timing("reduce_metrics"):
+                metrics["avg_metrics"].update(
+                    pytorch._convert_metrics_to_numpy(
+                        self.context.reduce_metrics(for_training=True)
+                    )
+                )
 
         if not self.is_chief:
             # The training metrics are reported only in the chief process.
@@ -496,15 +582,9 @@ class PyTorchTrialController(det.TrialController):
 
         step_start_time = time.time()
 
-        for callback in self.callbacks.values():
-            if util.is_overridden(callback.on_validation_step_start, pytorch.PyTorchCallback):
-                logging.warning(
-                    "on_validation_step_start is now deprecated, "
-                    "please use on_validation_start instead"
-                )
+        for name, callback in self.callbacks.items():
+            if self._cb_overrides[name]["on_validation_step_start"]:
                 callback.on_validation_step_start()
-
-        for callback in self.callbacks.values():
             callback.on_validation_start()
 
         num_inputs = 0
@@ -513,6 +593,7 @@ class PyTorchTrialController(det.TrialController):
         if self._evaluate_batch_defined():
             keys = None
             batch_metrics = []
+            pending_devices = set()  # type: Set[torch.device]
 
             self.validation_loader = cast(torch.utils.data.DataLoader, self.validation_loader)
             check.gt(len(self.validation_loader), 0)
@@ -523,10 +604,11 @@ class PyTorchTrialController(det.TrialController):
                     batch = self.context.to_device(batch)
                 num_inputs += self.trial.get_batch_length(batch)
 
-                if has_param(self.trial.evaluate_batch, "batch_idx", 2):
-                    vld_metrics = self.trial.evaluate_batch(batch=batch, batch_idx=idx)
-                else:
-                    vld_metrics = self.trial.evaluate_batch(batch=batch)  # type: ignore
+                with self._sync_debug_mode():
+                    if has_param(self.trial.evaluate_batch, "batch_idx", 2):
+                        vld_metrics = self.trial.evaluate_batch(batch=batch, batch_idx=idx)
+                    else:
+                        vld_metrics = self.trial.evaluate_batch(batch=batch)  # type: ignore
                 # Verify validation metric names are the same across batches.
                 if keys is None:
                     keys = vld_metrics.keys()
@@ -543,11 +625,15 @@ class PyTorchTrialController(det.TrialController):
                     "dictionary of string names to Tensor "
                     "metrics",
                 )
-                # TODO: For performance perform -> cpu() only at the end of validation.
-                batch_metrics.append(pytorch._convert_metrics_to_numpy(vld_metrics))
+                # Scalar metrics are copied to the host without waiting, and are only synchronized
+                # on once, at the end of validation.
+                pending_devices |= pytorch._copy_metrics_to_host_async(vld_metrics)
+                batch_metrics.append(vld_metrics)
                 if self.env.test_mode:
                     break
 
+            batch_metrics = pytorch._convert_batch_metrics_to_numpy(batch_metrics, pending_devices)
+
             for callback in self.callbacks.values():
                 callback.on_validation_epoch_end(batch_metrics)
 
@@ -580,26 +666,23 @@ class PyTorchTrialController(det.TrialController):
                 metrics = pytorch._convert_metrics_to_numpy(metrics)
                 num_inputs = self.context.get_per_slot_batch_size() * len(self.validation_loader)
 
-        metrics.update(
-            pytorch._convert_metrics_to_numpy(self.context.reduce_metrics(for_training=False))
-        )
+        if self.context._wrapped_reducers:
+            metrics.update(
+                pytorch._convert_metrics_to_numpy(self.context.reduce_metrics(for_training=False))
+            )
 
         if self.context.distributed.size > 1 and any(
-            util.is_overridden(c.on_validation_end, pytorch.PyTorchCallback)
-            or util.is_overridden(c.on_validation_step_end, pytorch.PyTorchCallback)
-            for c in self.callbacks.values()
+            overrides["on_validation_end"] or overrides["on_validation_step_end"]
+            for overrides in self._cb_overrides.values()
         ):
             logging.debug(
                 "Broadcasting metrics to all worker processes to execute a "
                 "validation step end callback"
             )
-            metrics = hvd.broadcast_object(metrics, root_rank=0)
+            metrics = self.context.distributed.broadcast(metrics)
 
-        for callback in self.callbacks.values():
-            if util.is_overridden(callback.on_validation_step_end, pytorch.PyTorchCallback):
-                logging.warning(
-                    "on_validation_step_end is now deprecated, please use on_validation_end instead"
-                )
+        for name, callback in self.callbacks.items():
+            if self._cb_overrides[name]["on_validation_step_end"]:
                 callback.on_validation_step_end(metrics)
 
         for callback in self.callbacks.values():
@@ -632,7 +715,7 @@ class PyTorchTrialController(det.TrialController):
         for ckpt_path in potential_paths:
             maybe_ckpt = load_path.joinpath(*ckpt_path)
             if maybe_ckpt.exists():
-                checkpoint = torch.load(str(maybe_ckpt), map_location="cpu")  # type: ignore
+                checkpoint = self._load_checkpoint_file(maybe_ckpt)
                 break
         if checkpoint is None or not isinstance(checkpoint, dict):
             return
@@ -646,24 +729,13 @@ class PyTorchTrialController(det.TrialController):
             check.eq(len(self.context.models), 1)
             self.context.models[0].load_state_dict(checkpoint["model_state_dict"])
         else:
-            for idx, model in enumerate(self.context.models):
-                model_state_dict = checkpoint["models_state_dict"][idx]
-                try:
-                    model.load_state_dict(model_state_dict)
-                except Exception:
-                    # If the checkpointed model is non-DDP and the current model is DDP, append
-                    # module prefix to the checkpointed data
-                    if isinstance(model, torch.nn.parallel.DistributedDataParallel):
-                        logging.debug("Loading non-DDP checkpoint into a DDP model")
-                        self._add_prefix_in_state_dict_if_not_present(model_state_dict, "module.")
-                    else:
-                        # If the checkpointed model is DDP and we are currently running in
-                        # single-slot mode, remove the module prefix from checkpointed data
-                        logging.debug("Loading DDP checkpoint into a non-DDP model")
-                        torch.nn.modules.utils.consume_prefix_in_state_dict_if_present(
-                            model_state_dict, "module."
-                        )
-                    model.load_state_dict(model_state_dict)
+            self._load_state_dicts_concurrently(
+                self._load_model_state_dict,
+                (
+                    (model, checkpoint["models_state_dict"][idx])
+                    for idx, model in enumerate(self.context.models)
+                ),
+            )
 
         if "optimizer_state_dict" in checkpoint:
             # Backward compatible with older checkpoint format.
@@ -671,8 +743,13 @@ class PyTorchTrialController(det.TrialController):
             check.eq(len(self.context.optimizers), 1)
             self.context.optimizers[0].load_state_dict(checkpoint["optimizer_state_dict"])
         else:
-            for idx, optimizer in enumerate(self.context.optimizers):
-                optimizer.load_state_dict(checkpoint["optimizers_state_dict"][idx])
+            self._load_state_dicts_concurrently(
+                lambda optimizer, state_dict: optimizer.load_state_dict(state_dict),
+                (
+                    (optimizer, checkpoint["optimizers_state_dict"][idx])
+                    for idx, optimizer in enumerate(self.context.optimizers)
+                ),
+            )
 
         if "lr_scheduler" in checkpoint:
             # Backward compatible with older checkpoint format.
@@ -738,7 +815,7 @@ class PyTorchTrialController(det.TrialController):
         for name in self.callbacks:
             if name in callback_state:
                 self.callbacks[name].load_state_dict(callback_state[name])
-            elif util.is_overridden(self.callbacks[name].load_state_dict, pytorch.PyTorchCallback):
+            elif self._cb_overrides[name]["load_state_dict"]:
                 logging.warning(
                     f"Callback '{name}' implements load_state_dict(), but no callback state "
                     "was found for that name when restoring from checkpoint. This "
@@ -814,9 +891,82 @@ class PyTorchTrialController(det.TrialController):
                 f2,
             )
 
+    @contextlib.contextmanager
+    def _sync_debug_mode(self) -> Iterator[None]:
+        """
+        In debug mode, make PyTorch warn about every host-device synchronization in this context.
+        Validation metrics are only copied off the device once, at the end of validation, so this
+        points at the .item() or .cpu() calls in user code that still stall the GPU on every batch.
+        """
+        if not self._warn_on_sync:
+            yield
+            return
+
+        prev_mode = torch.cuda.get_sync_debug_mode()
+        torch.cuda.set_sync_debug_mode("warn")
+        try:
+            yield
+        finally:
+            torch.cuda.set_sync_debug_mode(prev_mode)
+
     def _sync_device(self) -> None:
         torch.cuda.synchronize(self.context.device)
 
+    def _load_model_state_dict(self, model: torch.nn.Module, model_state_dict: Dict) -> None:
+        try:
+            model.load_state_dict(model_state_dict)
+        except Exception:
+            # If the checkpointed model is non-DDP and the current model is DDP, append
+            # module prefix to the checkpointed data
+            if isinstance(model, torch.nn.parallel.DistributedDataParallel):
+                logging.debug("Loading non-DDP checkpoint into a DDP model")
+                self._add_prefix_in_state_dict_if_not_present(model_state_dict, "module.")
+            else:
+                # If the checkpointed model is DDP and we are currently running in
+                # single-slot mode, remove the module prefix from checkpointed data
+                logging.debug("Loading DDP checkpoint into a non-DDP model")
+                torch.nn.modules.utils.consume_prefix_in_state_dict_if_present(
+                    model_state_dict, "module."
+                )
+            model.load_state_dict(model_state_dict)
+
+    @staticmethod
+    def _load_state_dicts_concurrently(
+        load_fn: Callable[[Any, Any], None], objs_and_state_dicts: Iterable[Tuple[Any, Any]]
+    ) -> None:
+        """
+        Call load_fn(obj, state_dict) for every pair. With more than one pair, the loads run on a
+        small thread pool: load_state_dict() spends most of its time in tensor copies, which
+        release the GIL, so several models or optimizers can be restored at once.
+        """
+        pairs = list(objs_and_state_dicts)
+        if len(pairs) < 2:
+            for obj, state_dict in pairs:
+                load_fn(obj, state_dict)
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(pairs))) as executor:
+            futures = [executor.submit(load_fn, obj, state_dict) for obj, state_dict in pairs]
+            # Re-raise the first failure, in the same order a serial loop would have hit it.
+            for future in futures:
+                future.result()
+
+    @staticmethod
+    def _load_checkpoint_file(path: pathlib.Path) -> Any:
+        """
+        Load a checkpoint onto the CPU. Where PyTorch supports it, zipfile-format checkpoints are
+        memory-mapped, so tensors are paged in from disk as they are loaded into the model instead
+        of the whole file being read into memory first.
+        """
+        kwargs = {}  # type: Dict[str, Any]
+        load_params = signature(torch.load).parameters
+        if "weights_only" in load_params:
+            # Checkpoints hold NumPy and Python RNG state, which weights_only=True would reject.
+            kwargs["weights_only"] = False
+        if "mmap" in load_params and zipfile.is_zipfile(str(path)):
+            kwargs["mmap"] = True
+        return torch.load(str(path), map_location="cpu", **kwargs)  # type: ignore
+
     @staticmethod
     def _add_prefix_in_state_dict_if_not_present(state_dict: Dict[str, Any], prefix: str) -> None:
         """Adds the prefix in state_dict in place, if does not exist.
@@ -7,7 +7,7 @@ import pickle
 import random
 import time
 import uuid
-from typing import Any, Callable, Dict, Iterator, List, Optional, Type, Union, cast
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Type, Union, cast
 
 import deepspeed
 import numpy as np
@@ -340,7 +340,9 @@ class DeepSpeedTrialController(det.TrialController):
                             all_resources = self.context.distributed.gather(
                                 storage.StorageManager._list_directory(path)
                             )
-                        resources = {k: v for d in all_resources for k, v in d.items()}
+                        resources = {}  # type: Dict[str, int]
+                        for node_resources in all_resources:
+                            resources.update(node_resources)
 
                         self.context._core.checkpoint._report_checkpoint(
                             storage_id, resources, metadata
@@ -405,6 +407,10 @@ class DeepSpeedTrialController(det.TrialController):
         start = total_batches_processed
         end = start + num_batches
 
+        # The model parallel layout does not change during a step.
+        data_parallel_world_size = self.context._mpu.data_parallel_world_size
+        should_report_metrics = self.context._mpu.should_report_metrics
+
         per_batch_metrics = []  # type: List[Dict]
         num_inputs = 0
 
@@ -413,12 +419,13 @@ class DeepSpeedTrialController(det.TrialController):
             self.prof.update_batch_idx(batch_idx)
             batch_start_time = time.time()
             self.context._current_batch_idx = batch_idx
+            epoch_idx = self.get_epoch_idx(batch_idx)
             if self.context.is_epoch_start():
                 for callback in self.callbacks.values():
                     with self.prof.record_timing(
                         f"callbacks.{callback.__class__.__name__}.on_training_epoch_start"
                     ):
-                        callback.on_training_epoch_start(self.get_epoch_idx(batch_idx))
+                        callback.on_training_epoch_start(epoch_idx)
             # This can be inaccurate if the user's data loader does not return batches with
             # the micro batch size.  It is also slightly inaccurate if the data loader can return
             # partial batches.  The same sort of assumptions are made in the DeepSpeed
@@ -436,10 +443,10 @@ class DeepSpeedTrialController(det.TrialController):
                 with self.prof.record_timing("train_batch", requires_sync=False, accumulate=True):
                     tr_metrics = self.trial.train_batch(
                         self.training_iterator,
-                        self.get_epoch_idx(batch_idx),
+                        epoch_idx,
                         batch_idx,
                     )
-                if self.context._mpu.should_report_metrics:
+                if should_report_metrics:
                     if isinstance(tr_metrics, torch.Tensor):
                         tr_metrics = {"loss": tr_metrics}
                     if not isinstance(tr_metrics, dict):
@@ -448,13 +455,10 @@ class DeepSpeedTrialController(det.TrialController):
                             f"mapping string names to Tensor metrics, got {type(tr_metrics)}",
                         )
 
-                    for name, metric in tr_metrics.items():
-                        # Convert PyTorch metric values to NumPy, so that
-                        # `det.util.encode_json` handles them properly without
-                        # needing a dependency on PyTorch.
-                        if isinstance(metric, torch.Tensor):
-                            metric = metric.cpu().detach().numpy()
-                        tr_metrics[name] = metric
+                    # Convert PyTorch metric values to NumPy, so that
+                    # `det.util.encode_json` handles them properly without
+                    # needing a dependency on PyTorch.
+                    tr_metrics = pytorch._convert_metrics_to_numpy(tr_metrics)
                     per_batch_metrics.append(tr_metrics)
             # We do a check here to make sure that we do indeed process `num_micro_batches_per_slot`
             # micro batches when training a batch for models that do not use pipeline parallelism.
@@ -466,7 +470,7 @@ class DeepSpeedTrialController(det.TrialController):
 
             batch_dur = time.time() - batch_start_time
             samples_per_second = batch_inputs / batch_dur
-            samples_per_second *= self.context._mpu.data_parallel_world_size
+            samples_per_second *= data_parallel_world_size
             self.prof.record_metric("samples_per_second", samples_per_second)
 
             if self.context.is_epoch_end():
@@ -474,7 +478,7 @@ class DeepSpeedTrialController(det.TrialController):
                     with self.prof.record_timing(
                         f"callbacks.{callback.__class__.__name__}.on_training_epoch_end"
                     ):
-                        callback.on_training_epoch_end(self.get_epoch_idx(batch_idx))
+                        callback.on_training_epoch_end(epoch_idx)
 
         # Aggregate and reduce training metrics from all the training processes.
         if self.context.distributed.size > 1 and self.context._average_training_metrics:
@@ -482,15 +486,18 @@ class DeepSpeedTrialController(det.TrialController):
                 per_batch_metrics = pytorch._combine_and_average_training_metrics(
                     self.context.distributed, per_batch_metrics
                 )
-        num_inputs *= self.context._mpu.data_parallel_world_size
+        num_inputs *= data_parallel_world_size
         metrics = det.util.make_metrics(num_inputs, per_batch_metrics)
 
         # Ignore batch_metrics entirely for custom reducers; there's no guarantee that per-batch
         # metrics are even logical for a custom reducer.
-        with self.prof.record_timing("reduce_metrics"):
-            metrics["avg_metrics"].update(
-                pytorch._convert_metrics_to_numpy(self.context.reduce_metrics(for_training=True))
-            )
+        if self.context._wrapped_reducers:
+            with self.prof.record_timing("reduce_metrics"):
+                metrics["avg_metrics"].update(
+                    pytorch._convert_metrics_to_numpy(
+                        self.context.reduce_metrics(for_training=True)
+                    )
+                )
 
         if not self.is_chief:
             # The training metrics are reported only in the chief process.
@@ -531,6 +538,7 @@ class DeepSpeedTrialController(det.TrialController):
         num_inputs = 0
         keys = None
         batch_metrics = []
+        pending_devices = set()  # type: Set[torch.device]
 
         for callback in self.callbacks.values():
             callback.on_validation_epoch_start()
@@ -557,19 +565,28 @@ class DeepSpeedTrialController(det.TrialController):
                         raise det.errors.InvalidExperimentException(
                             "Validation metric names must match across all batches of data.",
                         )
-                # TODO: For performance perform -> cpu() only at the end of validation.
-                batch_metrics.append(pytorch._convert_metrics_to_numpy(vld_metrics))
+                # Scalar metrics are copied to the host without waiting, and are only synchronized
+                # on once, at the end of validation.
+                pending_devices |= pytorch._copy_metrics_to_host_async(vld_metrics)
+                batch_metrics.append(vld_metrics)
             if self.env.test_mode:
                 break
 
+        batch_metrics = pytorch._convert_batch_metrics_to_numpy(batch_metrics, pending_devices)
+
         # keys and list(keys) does not satisfy all cases because it will return dict_keys type if
         # keys is an empty dict. this will then break when passed to zmq_broadcast since it does
         # not know how to serialize dict_keys type.
-        all_keys = self.context.distributed.gather(keys if keys is None else list(keys))
-        if self.is_chief:
-            all_keys = [k for k in all_keys if k is not None]
-            keys = all_keys[0]
-        keys = self.context.distributed.broadcast(keys)
+        local_keys = keys if keys is None else list(keys)
+        # Usually the chief reports metrics itself, so its keys can be broadcast directly. Only if
+        # it has none do we need to gather every rank's keys to find a rank that does.
+        keys = self.context.distributed.broadcast(local_keys)
+        if keys is None:
+            all_keys = self.context.distributed.gather(local_keys)
+            if self.is_chief:
+                all_keys = [k for k in all_keys if k is not None]
+                keys = all_keys[0]
+            keys = self.context.distributed.broadcast(keys)
 
         for callback in self.callbacks.values():
             callback.on_validation_epoch_end(batch_metrics)
@@ -580,9 +597,10 @@ class DeepSpeedTrialController(det.TrialController):
             keys=keys,
             metrics_reducers=pytorch._prepare_metrics_reducers(pytorch.Reducer.AVG, keys=keys),
         )
-        metrics.update(
-            pytorch._convert_metrics_to_numpy(self.context.reduce_metrics(for_training=False))
-        )
+        if self.context._wrapped_reducers:
+            metrics.update(
+                pytorch._convert_metrics_to_numpy(self.context.reduce_metrics(for_training=False))
+            )
 
         if self.context.distributed.size > 1 and any(
             util.is_overridden(c.on_validation_end, pytorch.PyTorchCallback)
@@ -688,7 +706,12 @@ class DeepSpeedTrialController(det.TrialController):
     def _save(self, path: pathlib.Path) -> None:
         if self.context.distributed.local_rank == 0:
             path.mkdir(parents=True, exist_ok=True)
-        _ = self.context.distributed.gather_local(None)  # sync
+        # Wait for the directory to exist. DeepSpeed sets up torch.distributed, so prefer its
+        # payload-free barrier over pickling a message from every rank through ZMQ.
+        if torch.distributed.is_initialized():
+            torch.distributed.barrier()
+        else:
+            _ = self.context.distributed.gather_local(None)  # sync
 
         if self.is_chief:
             # We assume these stateful objects should be the same across slots and only have
@@ -36,9 +36,9 @@ def make_data_parallel_mpu(dist_context: core.DistributedContext) -> ModelParall
 
 
 def make_deepspeed_mpu(topology: topology.PipelineParallelGrid) -> ModelParallelUnit:
-    is_first_pipeline_stage = topology.get_pipe_parallel_rank() == 0
-    last_stage = topology.get_pipe_parallel_world_size() - 1
-    is_last_pipeline_stage = topology.get_pipe_parallel_rank() == last_stage
+    pipe_parallel_rank = topology.get_pipe_parallel_rank()
+    is_first_pipeline_stage = pipe_parallel_rank == 0
+    is_last_pipeline_stage = pipe_parallel_rank == topology.get_pipe_parallel_world_size() - 1
     should_build_data_loader = topology.get_slice_parallel_rank() == 0 and (
         is_first_pipeline_stage or is_last_pipeline_stage
     )
@@ -2,6 +2,7 @@ import collections
 import contextlib
 import datetime
 import enum
+import errno
 import inspect
 import json
 import logging
@@ -11,6 +12,7 @@ import os
 import pathlib
 import random
 import re
+import selectors
 import shutil
 import signal
 import socket
@@ -114,6 +116,22 @@ def validate_batch_metrics(batch_metrics: List[Dict[str, Any]]) -> None:
         check.eq(metric_dict_keys, keys, "inconsistent training metrics: index: {}".format(idx))
 
 
+def _as_float_array(values: Any) -> Any:
+    """
+    Return values as a float64 ndarray, or None if they do not form a regular array of numbers.
+    Strings, None and other objects are never converted, even when float() would accept them.
+    """
+    import numpy as np
+
+    try:
+        arr = np.asarray(values)
+    except (TypeError, ValueError):
+        return None
+    if arr.dtype.kind not in "biuf":
+        return None
+    return arr.astype(np.float64)
+
+
 def make_metrics(num_inputs: Optional[int], batch_metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Make metrics dict including aggregates given individual data points."""
     import numpy as np
@@ -125,9 +143,16 @@ def make_metrics(num_inputs: Optional[int], batch_metrics: List[Dict[str, Any]])
     for name, values in metric_dict.items():
         m = None  # type: Optional[float]
         try:
-            values = np.array(values)
-            filtered_values = values[values != None]  # noqa: E711
-            m = np.mean(filtered_values).item()
+            # Reduce numeric metrics as a float64 array rather than filtering an object array in
+            # Python. Series with missing (None) values are not converted and take the filtering
+            # path below.
+            float_values = _as_float_array(values)
+            if float_values is not None:
+                m = np.mean(float_values).item()
+            else:
+                values = np.array(values)
+                filtered_values = values[values != None]  # noqa: E711
+                m = np.mean(filtered_values).item()
         except (TypeError, ValueError):
             # If we get here, values are non-scalars, which cannot be averaged.
             # We keep the key so consumers can see all the metric names but
@@ -317,6 +342,91 @@ def check_sshd(peer_addr: str, deadline: float, port: int) -> None:
                 time.sleep(0.1)
 
 
+def check_sshd_all(peer_addrs: List[str], deadline: float, port: int) -> None:
+    """
+    Waits for every peer machine to be ready to accept SSHD connections.
+
+    This is equivalent to calling check_sshd() on each peer in turn, except that all peers are
+    polled concurrently with non-blocking sockets, so the wait is bounded by the slowest peer
+    rather than the sum over all peers.
+
+    :param peer_addrs: addresses of machines running SSHD
+    :param deadline: time to wait until SSHD ready
+    :param port: port on addresses running SSHD
+    :return: raises Exception if SSHD connection invalid or timeout on any peer
+    """
+    # Peers which need a new connection attempt, mapped to the earliest time to make it.
+    retry_at = {addr: 0.0 for addr in peer_addrs}
+    # In-flight connection attempts, mapped to the time at which each attempt is abandoned.
+    attempts = {}  # type: Dict[socket.socket, float]
+
+    with selectors.DefaultSelector() as sel:
+
+        def finish(sock: socket.socket) -> str:
+            addr = cast(str, sel.unregister(sock).data)
+            del attempts[sock]
+            sock.close()
+            return addr
+
+        def retry(sock: socket.socket) -> None:
+            retry_at[finish(sock)] = time.time() + 0.1
+
+        try:
+            while retry_at or attempts:
+                now = time.time()
+                if now > deadline:
+                    pending = list(retry_at) + [sel.get_key(s).data for s in attempts]
+                    raise ValueError(
+                        f"Chief machine was unable to connect to sshd on peer machine at "
+                        f"{pending[0]}:{port}"
+                    )
+
+                for addr in [a for a, t in retry_at.items() if t <= now]:
+                    del retry_at[addr]
+                    sock = socket.socket()
+                    sock.setblocking(False)
+                    try:
+                        # connect_ex() still raises for errors such as a name that does not
+                        # resolve yet; retry those like any other failed attempt.
+                        started = sock.connect_ex((addr, port)) in (0, errno.EINPROGRESS)
+                    except OSError:
+                        started = False
+                    if not started:
+                        sock.close()
+                        retry_at[addr] = now + 0.1
+                        continue
+                    sel.register(sock, selectors.EVENT_WRITE, addr)
+                    attempts[sock] = now + 1
+
+                for key, events in sel.select(timeout=0.1):
+                    sock = cast(socket.socket, key.fileobj)
+                    if events & selectors.EVENT_WRITE:
+                        # The connect() completed; find out whether it succeeded.
+                        if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+                            retry(sock)
+                        else:
+                            # The ssh protocol requires the server to serve an initial greeting.
+                            # Wait for part of that greeting to know that sshd is responding.
+                            sel.modify(sock, selectors.EVENT_READ, key.data)
+                        continue
+                    try:
+                        data = sock.recv(1)
+                    except OSError:
+                        data = b""
+                    if data:
+                        # This peer is ready.
+                        finish(sock)
+                    else:
+                        retry(sock)
+
+                now = time.time()
+                for sock in [s for s, t in attempts.items() if t < now]:
+                    retry(sock)
+        finally:
+            for sock in attempts:
+                sock.close()
+
+
 def match_legacy_trial_class(arg: str) -> bool:
     """
     Legacy trial-class entrypoints are of the form: module.submodule:ClassName
@@ -227,6 +227,21 @@ def test_schemas(test_case: str) -> None:
     Case(**case).run()
 
 
+def test_iter_validation_errors() -> None:
+    url = "http://determined.ai/schemas/expconf/v0/experiment.json"
+    bad = {"min_validation_period": {"batches": "not a number"}, "name": 1}
+
+    errors = expconf.iter_validation_errors(bad, url)
+    assert isinstance(errors, Iterator)
+    assert next(errors).startswith("<config>")
+
+    # The materialized form is just the sorted version of the lazy form.
+    assert sorted(expconf.iter_validation_errors(bad, url)) == expconf.sanity_validation_errors(
+        bad, url
+    )
+    assert not list(expconf.iter_validation_errors({}, url))
+
+
 def lint_schema_subclasses(cls: type) -> None:
     """Recursively check all SchemaBase subclasses"""
     for sub in cls.__subclasses__():
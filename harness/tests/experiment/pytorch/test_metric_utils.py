@@ -84,6 +84,40 @@ def test_average_training_metrics() -> None:
     ]
     assert averaged_metrics == expected_metrics
 
+    # Test missing values and multi-element array metrics
+    combined_timeseries = {
+        "loss1": [[1, None], [3, 4]],
+        "loss2": [
+            [np.array([-1, -3]), np.array([-2, -4])],
+            [np.array([-5, -7]), np.array([-6, -8])],
+        ],
+    }
+    averaged_metrics = metric_utils._average_training_metrics(
+        combined_timeseries, combined_num_batches
+    )
+    expected_metrics = [
+        {"loss1": 2, "loss2": np.array(-4)},
+        {"loss1": 4, "loss2": np.array(-5)},
+    ]
+    assert averaged_metrics == expected_metrics
+
+
+def test_average_training_metrics_propagates_nan() -> None:
+    combined_timeseries = {
+        "loss": [[1.0, float("nan")], [3.0, 4.0]],
+        "missing": [[1.0, None], [3.0, 4.0]],
+    }
+    averaged_metrics = metric_utils._average_training_metrics(combined_timeseries, [2, 2])
+    assert averaged_metrics[0] == {"loss": 2.0, "missing": 2.0}
+    assert np.isnan(averaged_metrics[1]["loss"])
+    assert averaged_metrics[1]["missing"] == 4.0
+
+
+def test_average_training_metrics_rejects_strings() -> None:
+    combined_timeseries = {"tag": [["1", "2"], ["3", "4"]]}
+    with pytest.raises(TypeError):
+        metric_utils._average_training_metrics(combined_timeseries, [2, 2])
+
 
 def test_prepare_metric_reducers() -> None:
     metrics_dict = {"loss1": 1, "loss2": 2}
@@ -113,3 +147,101 @@ def test_convert_metrics_to_numpy() -> None:
     metrics = {"loss1": 1, "loss2": torch.tensor(2)}
     converted_metrics = metric_utils._convert_metrics_to_numpy(metrics)
     assert converted_metrics == {"loss1": 1, "loss2": np.array(2)}
+
+    # Training metrics may still be attached to the autograd graph.
+    metrics = {"loss": torch.tensor([1.0, 2.0], requires_grad=True) * 2}
+    converted_metrics = metric_utils._convert_metrics_to_numpy(metrics)
+    assert isinstance(converted_metrics["loss"], np.ndarray)
+    assert converted_metrics["loss"].tolist() == [2.0, 4.0]
+
+
+def test_convert_batch_metrics_to_numpy() -> None:
+    batch_metrics = [{"loss": torch.tensor(float(i)), "count": i} for i in range(3)]
+    converted_metrics = metric_utils._convert_batch_metrics_to_numpy(batch_metrics)
+    assert converted_metrics == [{"loss": np.array(float(i)), "count": i} for i in range(3)]
+    assert all(isinstance(m["loss"], np.ndarray) for m in converted_metrics)
+
+
+def test_copy_metrics_to_host_async_leaves_host_metrics() -> None:
+    metrics = {"loss": torch.tensor(1.0), "preds": torch.ones(3), "count": 2}
+    assert metric_utils._copy_metrics_to_host_async(metrics) == set()
+    converted_metrics = metric_utils._convert_batch_metrics_to_numpy([metrics], set())
+    assert converted_metrics[0]["loss"] == np.array(1.0)
+    assert np.array_equal(converted_metrics[0]["preds"], np.ones(3))
+    assert converted_metrics[0]["count"] == 2
+
+
+def test_combine_metrics_across_processes_stacks_arrays() -> None:
+    class FakeContext:
+        size = 2
+        rank = 0
+
+        def gather(self, stuff: Any) -> List[Any]:
+            self.gathered = stuff
+            return [stuff, stuff]
+
+    metrics = {
+        "loss": [np.array(1.0), np.array(2.0)],
+        "vector": [np.array([1, 2]), np.array([3, 4])],
+        "mixed": [np.array(1.0), None],
+    }
+    context = FakeContext()
+    combined, num_batches = metric_utils._combine_metrics_across_processes(
+        context, metrics, num_batches=2  # type: ignore
+    )
+
+    # Uniform ndarray series are shipped as one array; anything else is sent as-is.
+    assert isinstance(context.gathered[0]["loss"], metric_utils._StackedMetric)
+    assert isinstance(context.gathered[0]["vector"], metric_utils._StackedMetric)
+    assert context.gathered[0]["mixed"] is metrics["mixed"]
+
+    assert num_batches == [2, 2]
+    assert combined is not None
+    for name, values in metrics.items():
+        for process_values in combined[name]:
+            assert len(process_values) == len(values)
+            for got, want in zip(process_values, values):
+                assert type(got) is type(want)
+                if want is not None:
+                    assert np.array_equal(got, want)
+
+
+def test_reduce_metrics_single_process() -> None:
+    class FakeContext:
+        size = 1
+        rank = 0
+
+    batch_metrics = [{"loss": np.array(float(i)), "acc": np.array(i % 2)} for i in range(4)]
+    metrics = metric_utils._reduce_metrics(
+        FakeContext(),  # type: ignore
+        batch_metrics=batch_metrics,
+        keys=batch_metrics[0].keys(),
+        metrics_reducers={"loss": pytorch.Reducer.AVG, "acc": pytorch.Reducer.SUM},
+    )
+    assert metrics == {"loss": 1.5, "acc": 2}
+
+
+def test_simple_reduce_metrics_by_group() -> None:
+    rng = np.random.default_rng(0)
+    metrics = {
+        "a": rng.random(6),
+        "b": rng.random(6),
+        "c": rng.integers(0, 10, size=6),
+        "d": rng.random((6, 2)),
+        "e": rng.random(6),
+    }  # type: Dict[str, Any]
+    reducers = {
+        "a": pytorch.Reducer.AVG,
+        "b": pytorch.Reducer.AVG,
+        "c": pytorch.Reducer.SUM,
+        "d": pytorch.Reducer.MAX,
+        "e": pytorch.Reducer.MIN,
+    }
+
+    for num_batches in (None, [1, 2, 3, 4, 5, 6]):
+        reduced = metric_utils._simple_reduce_metrics_by_group(reducers, metrics, num_batches)
+        assert list(reduced) == list(metrics)
+        for name, value in reduced.items():
+            expected = pytorch._simple_reduce_metrics(reducers[name], metrics[name], num_batches)
+            assert value == pytest.approx(expected)
+            assert type(value) is type(expected)
@@ -216,6 +216,42 @@ def test_to_device() -> None:
     assert np.array_equal(to_device(np.array([0, 1, 2]), "cpu"), np.array([0, 1, 2]))
 
 
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="no gpu available")
+@pytest.mark.gpu
+def test_to_device_pinned_pool() -> None:
+    pool = det.pytorch._PinnedBufferPool(torch.device("cuda"))
+    full = torch.arange(12, dtype=torch.float32).reshape(6, 2)
+    short = torch.ones(3, 2)
+
+    for batch in [full, full + 1, short, full + 2]:
+        out = det.pytorch._to_device({"x": batch, "y": batch.numpy()}, "cuda", None, pool)
+        assert out["x"].is_cuda and out["y"].is_cuda
+        assert torch.equal(out["x"].cpu(), batch)
+        assert torch.equal(out["y"].cpu(), batch)
+
+    # The short batch reused the buffers allocated for the full-size batches.
+    assert [slot[0].shape[0] for slot in pool._buffers[(torch.float32, torch.Size([2]))]] == [8, 8]
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="no gpu available")
+@pytest.mark.gpu
+def test_device_prefetcher() -> None:
+    batches = [{"x": torch.full((4, 2), i)} for i in range(3)]
+    prefetcher = det.pytorch._DevicePrefetcher(
+        iter(batches), lambda b: to_device(b, "cuda"), torch.device("cuda")
+    )
+
+    out = []
+    for batch in prefetcher:
+        assert batch["x"].is_cuda
+        out.append(batch["x"].cpu())
+        prefetcher.preload()
+
+    assert [int(x[0, 0]) for x in out] == [0, 1, 2]
+    with pytest.raises(StopIteration):
+        next(prefetcher)
+
+
 @pytest.mark.parametrize("dedup_between_calls", [True, False])
 def test_to_device_warnings(dedup_between_calls) -> None:
     # Capture warning logs as elements in a queue.
@@ -39,7 +39,7 @@ def test_parse_args() -> None:
 
 @mock.patch("subprocess.Popen")
 @mock.patch("determined.get_cluster_info")
-@mock.patch("determined.util.check_sshd")
+@mock.patch("determined.util.check_sshd_all")
 @mock.patch("time.time")
 def test_launch_multi_slot_chief(
     mock_time: mock.MagicMock,
@@ -89,12 +89,8 @@ def test_launch_multi_slot_chief(
 
     mock_subprocess.assert_has_calls([mock.call(sshd_cmd), mock.call(launch_cmd)])
 
-    assert mock_check_sshd.call_count == len(cluster_info.container_addrs)
-    mock_check_sshd.assert_has_calls(
-        [
-            mock.call(addr, mock_start_time + 20, constants.DTRAIN_SSH_PORT)
-            for addr in cluster_info.container_addrs
-        ]
+    mock_check_sshd.assert_called_once_with(
+        cluster_info.container_addrs, mock_start_time + 20, constants.DTRAIN_SSH_PORT
     )
 
     launch_proc_mock().wait.assert_called_once()
@@ -110,7 +106,7 @@ def test_launch_multi_slot_chief(
 
 @mock.patch("subprocess.Popen")
 @mock.patch("determined.get_cluster_info")
-@mock.patch("determined.util.check_sshd")
+@mock.patch("determined.util.check_sshd_all")
 @mock.patch("time.time")
 def test_launch_multi_slot_fail(
     mock_time: mock.MagicMock,
@@ -164,7 +160,7 @@ def test_launch_multi_slot_fail(
     mock_subprocess.assert_called_once_with(sshd_cmd)
 
     mock_check_sshd.assert_called_once_with(
-        cluster_info.container_addrs[0], mock_start_time + 20, constants.DTRAIN_SSH_PORT
+        cluster_info.container_addrs, mock_start_time + 20, constants.DTRAIN_SSH_PORT
     )
 
     sshd_proc_mock().kill.assert_called_once()
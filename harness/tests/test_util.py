@@ -1,5 +1,8 @@
 import os
 import pathlib
+import socket
+import threading
+import time
 from typing import Optional
 
 import pytest
@@ -18,6 +21,11 @@ def test_dict_to_list() -> None:
     assert r == [{"a": 1, "b": 3}, {"a": 2, "b": 4}]
 
 
+def test_make_metrics_does_not_average_strings() -> None:
+    metrics = det.util.make_metrics(2, [{"tag": "1", "loss": 1}, {"tag": "2", "loss": None}])
+    assert metrics["avg_metrics"] == {"tag": None, "loss": 1.0}
+
+
 def test_sizeof_fmt() -> None:
     assert det.common.util.sizeof_fmt(1024) == "1.0KB"
     assert det.common.util.sizeof_fmt(36) == "36.0B"
@@ -44,6 +52,33 @@ def test_calculate_batch_sizes() -> None:
         det.util.calculate_batch_sizes({"global_batch_size": 1}, 2, "Trial")
 
 
+def test_check_sshd_all() -> None:
+    with socket.socket() as ready, socket.socket() as closed:
+        ready.bind(("127.0.0.1", 0))
+        ready.listen()
+        closed.bind(("127.0.0.1", 0))
+
+        def greet() -> None:
+            for _ in range(2):
+                conn, _ = ready.accept()
+                with conn:
+                    conn.sendall(b"SSH-2.0-test\r\n")
+
+        t = threading.Thread(target=greet, daemon=True)
+        t.start()
+        port = ready.getsockname()[1]
+        det.util.check_sshd_all(["127.0.0.1", "localhost"], time.time() + 5, port)
+        t.join(timeout=5)
+
+        # Nothing is listening on the other socket, so this must time out.
+        with pytest.raises(ValueError, match="unable to connect to sshd"):
+            det.util.check_sshd_all(["127.0.0.1"], time.time() + 0.5, closed.getsockname()[1])
+
+        # A peer name that does not resolve yet is retried until the deadline, too.
+        with pytest.raises(ValueError, match="unable to connect to sshd"):
+            det.util.check_sshd_all(["no-such-host.invalid"], time.time() + 0.5, port)
+
+
 @pytest.mark.parametrize("whats_there", [None, "dir", "file", "symlink"])
 def test_force_create_symlink(whats_there: Optional[str], tmp_path: pathlib.Path) -> None:
     symlink_to_create = tmp_path.joinpath("tensorboard")